@@ -1,35 +1,412 @@
-from fastapi import FastAPI, Form, HTTPException
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi import FastAPI, Form, Header, HTTPException
+from fastapi.responses import FileResponse, ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware import Middleware
+import asyncio
+import hashlib
 import io
+import orjson
+import os
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+import gtts.tts
+import requests
 from gtts import gTTS
 from gtts.tts import gTTSError
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from typing import Optional, List
 import re
 
+# Tokenizer patterns, compiled once at import so hot /tts/chunked requests
+# don't depend on re's small internal pattern cache
+_WORD_RE = re.compile(r'\S+')
+# Possessive quantifiers (Python 3.11+) stop the sentence splitter from
+# backtracking, and the bounded repeats cap any single match so pathological
+# punctuation/whitespace runs are consumed in small fixed-size steps
+_SENT_RE = re.compile(r'[.!?]{1,16}+\s{0,32}+')
+
 app = FastAPI(
     title="Text to Speech API",
     description="Enhanced API for text to speech with advanced controls",
-    version="2.0.0"
+    version="2.0.0",
+    default_response_class=ORJSONResponse,
+    # CORS stays open to all origins, but methods and headers are narrowed to
+    # what the frontend actually sends (GET plus JSON/form POSTs, with
+    # If-None-Match for audio revalidation), and max_age lets browsers reuse
+    # one preflight response for a day instead of re-asking before every POST
+    middleware=[
+        Middleware(
+            CORSMiddleware,
+            allow_origins=["*"],
+            allow_credentials=True,
+            allow_methods=["GET", "POST"],
+            allow_headers=["Content-Type", "If-None-Match"],
+            max_age=86400,
+        )
+    ],
 )
 
-# Add CORS middleware to allow all origins
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Upper bound for TTS input, enforced with a plain len() check before any
+# strip/regex/synthesis work is spent on the text
+MAX_TEXT_LENGTH = 10000
+
+# Cache for synthesized MP3 bytes so repeated phrases skip the gTTS network call.
+# In-memory LRU keyed by sha256 of "voice|slow|text", backed by an optional
+# on-disk directory that survives restarts (set TTS_CACHE_DIR="" to disable).
+# Note the on-disk side is unbounded; entries are ~10-100 KB each and capped
+# by MAX_TEXT_LENGTH, so prune or clear the directory externally if disk
+# space matters on the deployment target.
+TTS_CACHE_MAXSIZE = 512
+TTS_CACHE_DIR = os.environ.get("TTS_CACHE_DIR", "tts_cache")
+
+_tts_cache: "OrderedDict[str, bytes]" = OrderedDict()
+_tts_cache_lock = threading.Lock()
+
+def make_cache_key(text: str, voice: str, slow: bool) -> str:
+    """Build the cache key for a synthesis request"""
+    # The engine is part of the key so cached gTTS MP3s are never served for
+    # a configuration that now synthesizes WAV locally (or vice versa)
+    engine = "piper" if _uses_piper(voice, slow) else "gtts"
+    return hashlib.sha256(f"{engine}|{voice}|{slow}|{text}".encode()).hexdigest()
+
+def cache_file_path(key: str, ext: str = "mp3") -> Optional[str]:
+    """Path of the on-disk copy for a cache key, or None if there is none"""
+    if not TTS_CACHE_DIR:
+        return None
+    path = os.path.join(TTS_CACHE_DIR, f"{key}.{ext}")
+    return path if os.path.isfile(path) else None
+
+def cache_get(key: str, ext: str = "mp3") -> Optional[bytes]:
+    """Look up cached audio, promoting hits to most-recently-used"""
+    with _tts_cache_lock:
+        data = _tts_cache.get(key)
+        if data is not None:
+            _tts_cache.move_to_end(key)
+            return data
+    path = cache_file_path(key, ext)
+    if path is not None:
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        cache_put(key, data, ext, persist=False)
+        return data
+    return None
+
+def cache_put(key: str, data: bytes, ext: str = "mp3", persist: bool = True) -> None:
+    """Store audio in the LRU cache, evicting the oldest entry when full"""
+    with _tts_cache_lock:
+        _tts_cache[key] = data
+        _tts_cache.move_to_end(key)
+        while len(_tts_cache) > TTS_CACHE_MAXSIZE:
+            _tts_cache.popitem(last=False)
+    if persist and TTS_CACHE_DIR:
+        try:
+            os.makedirs(TTS_CACHE_DIR, exist_ok=True)
+            # Write to a temp file and rename into place so concurrent
+            # readers - including other uvicorn workers sharing the
+            # directory and FileResponse - never see a partial file
+            fd, tmp_path = tempfile.mkstemp(dir=TTS_CACHE_DIR, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, os.path.join(TTS_CACHE_DIR, f"{key}.{ext}"))
+            except OSError:
+                os.unlink(tmp_path)
+                raise
+        except OSError:
+            pass  # disk cache is best-effort; the in-memory copy is enough
+
+# Bounded pool for the blocking gTTS network calls; keeps synthesis off the
+# event loop so concurrent requests don't serialize behind one another.
+_synth_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts-synth")
+
+class _PersistentSession:
+    """Context-manager stand-in for requests.Session that reuses one pool.
+
+    gTTS opens and closes a fresh Session for every audio part, paying a new
+    TCP+TLS handshake each time; this keeps the connection pool alive across
+    calls instead. Session's pool is thread-safe, so the synthesis workers
+    can share it.
+    """
+
+    _session = requests.Session()
+
+    def __enter__(self) -> requests.Session:
+        return self._session
+
+    def __exit__(self, *exc) -> None:
+        pass  # keep the pooled connections open for the next call
+
+class _RequestsShim:
+    """Forwards to requests but hands gTTS the persistent session"""
+
+    Session = _PersistentSession
+
+    def __getattr__(self, name):
+        return getattr(requests, name)
+
+# gtts.tts only does `with requests.Session() as s`, so rebinding the module's
+# `requests` name to the shim is enough to reuse the pool without patching
+# requests itself
+gtts.tts.requests = _RequestsShim()
+
+# Optional local neural TTS backend (Piper). When PIPER_MODEL points at a
+# voice model and piper-tts is installed, matching voices synthesize locally
+# with a model warm-loaded at startup - no network round-trip at all. Other
+# voices (and deployments without a model) keep using gTTS, which is what
+# lets this service cover 20+ languages on a small instance.
+PIPER_MODEL = os.environ.get("PIPER_MODEL", "")
+PIPER_VOICES = set(filter(None, os.environ.get("PIPER_VOICES", "en").split(",")))
+
+_piper_voice = None
+if PIPER_MODEL:
+    try:
+        from piper import PiperVoice
+        _piper_voice = PiperVoice.load(PIPER_MODEL)  # warm-load once at import
+    except Exception:
+        _piper_voice = None  # piper-tts missing or model unreadable; use gTTS
+
+def _uses_piper(voice: str, slow: bool) -> bool:
+    # Piper models are single-language and have no slow mode
+    return _piper_voice is not None and voice in PIPER_VOICES and not slow
+
+def audio_media_type(voice: str, slow: bool) -> str:
+    """Content type of the audio a given voice/speed combination produces"""
+    return "audio/wav" if _uses_piper(voice, slow) else "audio/mpeg"
+
+def audio_file_ext(voice: str, slow: bool) -> str:
+    """File extension matching audio_media_type, for cache files and downloads"""
+    return "wav" if _uses_piper(voice, slow) else "mp3"
+
+def write_speech_to_fp(text: str, voice: str, slow: bool, fp) -> None:
+    """Run synthesis, writing audio bytes to a file-like object"""
+    if _uses_piper(voice, slow):
+        # wave needs a seekable file to finalize its header, so synthesize
+        # into a buffer and copy out
+        buf = io.BytesIO()
+        with wave.open(buf, "wb") as wav_file:
+            _piper_voice.synthesize(text, wav_file)
+        fp.write(buf.getvalue())
+        return
+    tts = gTTS(text=text, lang=voice, slow=slow)
+    tts.write_to_fp(fp)
 
-# Pydantic models for request validation
+def synthesize_speech(text: str, voice: str, slow: bool) -> bytes:
+    """Run synthesis and return the audio bytes"""
+    buf = io.BytesIO()
+    write_speech_to_fp(text, voice, slow, buf)
+    return buf.getvalue()
+
+class _QueueWriter:
+    """File-like object forwarding gTTS chunks from a worker thread to an asyncio queue"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue):
+        self._loop = loop
+        self._queue = queue
+        self.parts: List[bytes] = []
+
+    def write(self, chunk: bytes) -> int:
+        self.parts.append(chunk)
+        self._loop.call_soon_threadsafe(self._queue.put_nowait, chunk)
+        return len(chunk)
+
+# Long texts are split into sentence batches synthesized concurrently on the
+# pool; gTTS itself builds one MP3 by concatenating ~100-char part streams,
+# so joining batch outputs back-to-back is safe
+PARALLEL_SYNTH_MIN_CHARS = 400
+PARALLEL_BATCH_TARGET_CHARS = 200
+
+def batch_sentences(text: str) -> List[str]:
+    """Group sentences into batches of roughly PARALLEL_BATCH_TARGET_CHARS"""
+    sentences = [chunk['text'] for chunk in tokenize_text(text, "sentence")]
+    if len(sentences) < 2:
+        return [text]
+
+    batches = []
+    current: List[str] = []
+    size = 0
+    for sentence in sentences:
+        if current and size + len(sentence) > PARALLEL_BATCH_TARGET_CHARS:
+            batches.append(" ".join(current))
+            current = []
+            size = 0
+        current.append(sentence)
+        size += len(sentence) + 1
+    if current:
+        batches.append(" ".join(current))
+    return batches
+
+# In-flight syntheses keyed like the cache, so concurrent requests for the
+# same text await one result instead of each calling gTTS (e.g. a classroom
+# pressing "read" on the same paragraph at once). Only touched on the event
+# loop, so no lock is needed.
+_pending: "dict[str, asyncio.Future]" = {}
+
+# Strong references to the finisher tasks below, so they aren't
+# garbage-collected before resolving their futures
+_background_tasks: "set[asyncio.Task]" = set()
+
+async def stream_speech_audio(text: str, voice: str, slow: bool):
+    """Yield MP3 bytes as gTTS produces them, caching the full result at the end"""
+    key = make_cache_key(text, voice, slow)
+    ext = audio_file_ext(voice, slow)
+    data = cache_get(key, ext)
+    if data is not None:
+        yield data
+        return
+
+    pending = _pending.get(key)
+    if pending is not None:
+        # An identical request is already being synthesized; share its result
+        yield await pending
+        return
+
+    loop = asyncio.get_running_loop()
+    future: asyncio.Future = loop.create_future()
+    # Retrieve the exception even if no duplicate request awaits this future,
+    # so asyncio doesn't log "exception was never retrieved"
+    future.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _pending[key] = future
+
+    # Batching relies on byte-concatenation being valid, which holds for the
+    # headerless MPEG frames gTTS emits but not for Piper's WAV output (each
+    # batch would be a complete file with its own header), so the local
+    # backend always synthesizes in one piece
+    if len(text) >= PARALLEL_SYNTH_MIN_CHARS and not _uses_piper(voice, slow):
+        batches = batch_sentences(text)
+    else:
+        batches = [text]
+
+    if len(batches) > 1:
+        # Fan the batches out across the pool and yield them in order as
+        # each finishes; later batches synthesize while earlier ones play
+        synth_tasks = [
+            loop.run_in_executor(_synth_pool, synthesize_speech, batch, voice, slow)
+            for batch in batches
+        ]
+    else:
+        queue: asyncio.Queue = asyncio.Queue()
+        writer = _QueueWriter(loop, queue)
+
+        def produce():
+            try:
+                write_speech_to_fp(text, voice, slow, writer)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+            return b"".join(writer.parts)
+
+        synth_tasks = [loop.run_in_executor(_synth_pool, produce)]
+
+    async def finish():
+        # Deliberately independent of the requesting client's generator: if
+        # the leading request disconnects mid-stream, the worker threads
+        # still complete, the cache is still filled, and coalesced followers
+        # awaiting the future still get their bytes.
+        try:
+            parts = await asyncio.gather(*synth_tasks)
+            data = b"".join(parts)
+            cache_put(key, data, ext)
+            future.set_result(data)
+        except BaseException as exc:
+            if not future.done():
+                future.set_exception(exc)
+        finally:
+            _pending.pop(key, None)
+
+    finisher = loop.create_task(finish())
+    _background_tasks.add(finisher)
+    finisher.add_done_callback(_background_tasks.discard)
+
+    if len(batches) > 1:
+        for batch_task in synth_tasks:
+            yield await batch_task
+    else:
+        while (chunk := await queue.get()) is not None:
+            yield chunk
+        await synth_tasks[0]  # propagate synthesis errors from the worker thread
+
+# Cached payloads up to this size are sent as a single Response body with a
+# Content-Length header; chunked streaming only pays off for larger audio
+SMALL_AUDIO_BYTES = 1024 * 1024
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Check an If-None-Match header value against a strong ETag"""
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+async def speech_response(text: str, voice: str, slow: bool, headers: dict,
+                          if_none_match: Optional[str] = None):
+    """Build the audio response, preferring a plain Response for small cache hits"""
+    media_type = audio_media_type(voice, slow)
+    key = make_cache_key(text, voice, slow)
+
+    # The key hashes everything that determines the audio, so it doubles as a
+    # strong ETag; a match means the client's copy is current, and on a cache
+    # miss the 304 even skips synthesis entirely
+    etag = f'"{key}"'
+    headers = {**headers, 'ETag': etag}
+    if if_none_match is not None and _etag_matches(etag, if_none_match):
+        return Response(status_code=304, headers=headers)
+
+    ext = audio_file_ext(voice, slow)
+    data = cache_get(key, ext)
+    if data is not None:
+        if len(data) <= SMALL_AUDIO_BYTES:
+            return Response(content=data, media_type=media_type, headers=headers)
+        # Large cached audio: serve the on-disk copy so uvicorn can use
+        # sendfile and the bytes never pass through the application
+        path = cache_file_path(key, ext)
+        if path is not None:
+            return FileResponse(path, media_type=media_type, headers=headers)
+        # No disk copy: a one-element iterator hands Starlette the bytes
+        # object as-is, with no BytesIO wrapper or intermediate copy. The
+        # size is known, so declare it and spare clients chunked transfer
+        # encoding
+        return StreamingResponse(
+            iter([data]),
+            media_type=media_type,
+            headers={**headers, 'Content-Length': str(len(data))}
+        )
+
+    stream = await open_speech_stream(text, voice, slow)
+    return StreamingResponse(stream, media_type=media_type, headers=headers)
+
+async def open_speech_stream(text: str, voice: str, slow: bool):
+    """Start synthesis and return an async iterator primed with its first chunk.
+
+    Priming surfaces gTTS errors here, before response headers are sent.
+    """
+    stream = stream_speech_audio(text, voice, slow)
+    try:
+        first = await anext(stream)
+    except StopAsyncIteration:
+        first = b""
+
+    async def chunks():
+        yield first
+        async for chunk in stream:
+            yield chunk
+
+    return chunks()
+
+# Pydantic models for request validation. Requests are read-only once parsed,
+# so the models are frozen (hashable, no per-instance mutation machinery) and
+# reject unknown fields instead of silently carrying them around.
 class TTSRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
     text: str
     voice: Optional[str] = "en"
     speed: Optional[float] = 1.0
 
 class ChunkedTTSRequest(BaseModel):
+    model_config = ConfigDict(extra='forbid', frozen=True)
+
     text: str
     voice: Optional[str] = "en"
     speed: Optional[float] = 1.0
@@ -63,49 +440,49 @@ def get_available_voices():
         {'id': 'ar', 'name': 'Arabic', 'language': 'العربية'},
     ]
 
+# The voice catalog is static, so serialize the /voices body once at import
+# instead of re-encoding the same 23 entries on every request
+_VOICES_JSON = orjson.dumps({"voices": get_available_voices()})
+
 def tokenize_text(text: str, chunk_type: str = "sentence") -> List[dict]:
     """Tokenize text into words or sentences with positions"""
+    # Scan all offsets in one pass first, then build the chunk dicts in bulk;
+    # the hot loop only handles ints, not dicts and intermediate strings
     if chunk_type == "word":
-        # Split by word boundaries while preserving positions
-        words = []
-        pattern = r'\S+'
-        for match in re.finditer(pattern, text):
-            words.append({
-                'text': match.group(),
-                'start': match.start(),
-                'end': match.end(),
-                'type': 'word'
+        # \S+ can never match surrounding whitespace, so no trimming is needed
+        spans = [match.span() for match in _WORD_RE.finditer(text)]
+        return [
+            {'text': text[start:end], 'start': start, 'end': end, 'type': 'word'}
+            for start, end in spans
+        ]
+
+    # Split by sentences: boundaries fall after each punctuation run, plus a
+    # trailing span for any unterminated text
+    spans = []
+    last_end = 0
+    for match in _SENT_RE.finditer(text):
+        spans.append((last_end, match.end()))
+        last_end = match.end()
+    if last_end < len(text):
+        spans.append((last_end, len(text)))
+
+    sentences = []
+    for start, end in spans:
+        # Trim by moving the offsets instead of slicing and stripping, so
+        # each sentence is sliced exactly once and start/end line up with
+        # the text they describe
+        while start < end and text[start].isspace():
+            start += 1
+        while end > start and text[end - 1].isspace():
+            end -= 1
+        if start < end:
+            sentences.append({
+                'text': text[start:end],
+                'start': start,
+                'end': end,
+                'type': 'sentence'
             })
-        return words
-    else:
-        # Split by sentences
-        sentences = []
-        pattern = r'[.!?]+[\s]*'
-        last_end = 0
-        
-        for match in re.finditer(pattern, text):
-            sentence_text = text[last_end:match.end()].strip()
-            if sentence_text:
-                sentences.append({
-                    'text': sentence_text,
-                    'start': last_end,
-                    'end': match.end(),
-                    'type': 'sentence'
-                })
-            last_end = match.end()
-        
-        # Add remaining text if any
-        if last_end < len(text):
-            remaining_text = text[last_end:].strip()
-            if remaining_text:
-                sentences.append({
-                    'text': remaining_text,
-                    'start': last_end,
-                    'end': len(text),
-                    'type': 'sentence'
-                })
-        
-        return sentences
+    return sentences
 
 @app.get("/")
 def read_root():
@@ -114,49 +491,56 @@ def read_root():
 @app.get("/voices")
 async def get_voices():
     """Get available TTS voices"""
-    try:
-        voices = get_available_voices()
-        return JSONResponse(content={"voices": voices})
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to get voices: {str(e)}")
+    # The catalog is static, so let browsers and proxies cache it for a day
+    return Response(
+        content=_VOICES_JSON,
+        media_type="application/json",
+        headers={'Cache-Control': 'public, max-age=86400'}
+    )
 
-@app.post("/tts")
-async def text_to_speech(request: TTSRequest):
-    """Convert text to speech and return audio stream"""
+async def handle_tts(text: str, voice: str, slow: bool, headers: dict,
+                     if_none_match: Optional[str] = None):
+    """Shared body of the /tts handlers; the routes only adapt their inputs.
+
+    Validates, then serves cached, coalesced or freshly streamed audio via
+    speech_response.
+    """
+    if len(text) > MAX_TEXT_LENGTH:
+        raise HTTPException(status_code=413, detail=f"Text too long (max {MAX_TEXT_LENGTH} characters)")
     try:
-        if not request.text.strip():
+        if not text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
-            
-        # Convert text to speech with specified voice
-        tts = gTTS(text=request.text, lang=request.voice, slow=(request.speed < 1.0))
-        
-        # Create a bytes buffer
-        buf = io.BytesIO()
-        
-        # Write audio to buffer
-        tts.write_to_fp(buf)
-        
-        # Reset buffer position
-        buf.seek(0)
-        
-        # Return the audio stream
-        return StreamingResponse(
-            buf, 
-            media_type="audio/mpeg",
-            headers={
-                'Content-Disposition': 'attachment; filename="speech.mp3"',
-                'Cache-Control': 'no-cache'
-            }
-        )
-        
+
+        return await speech_response(text, voice, slow, headers=headers,
+                                     if_none_match=if_none_match)
+
+    except HTTPException:
+        raise
     except gTTSError as e:
         raise HTTPException(status_code=500, detail=f"Text to speech conversion failed: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
 
+@app.post("/tts")
+async def text_to_speech(request: TTSRequest, if_none_match: Optional[str] = Header(None)):
+    """Convert text to speech and return audio stream"""
+    slow = request.speed < 1.0
+    return await handle_tts(
+        request.text,
+        request.voice,
+        slow=slow,
+        headers={
+            'Content-Disposition': f'attachment; filename="speech.{audio_file_ext(request.voice, slow)}"',
+            'Cache-Control': 'no-cache'
+        },
+        if_none_match=if_none_match
+    )
+
 @app.post("/tts/chunked")
 async def chunked_text_to_speech(request: ChunkedTTSRequest):
     """Get text chunks for highlighting during speech"""
+    if len(request.text) > MAX_TEXT_LENGTH:
+        raise HTTPException(status_code=413, detail=f"Text too long (max {MAX_TEXT_LENGTH} characters)")
     try:
         if not request.text.strip():
             raise HTTPException(status_code=400, detail="Text cannot be empty")
@@ -171,7 +555,7 @@ async def chunked_text_to_speech(request: ChunkedTTSRequest):
             'speed': request.speed
         }
         
-        return JSONResponse(content={
+        return ORJSONResponse(content={
             "chunks": chunks,
             "audio_config": audio_data,
             "total_chunks": len(chunks),
@@ -186,16 +570,20 @@ async def validate_text(text: str = Form(...)):
     """Validate text for TTS processing"""
     try:
         if not text.strip():
-            return JSONResponse(content={"valid": False, "error": "Text cannot be empty"})
+            return ORJSONResponse(content={"valid": False, "error": "Text cannot be empty"})
         
-        if len(text) > 10000:  # Reasonable limit for TTS
-            return JSONResponse(content={"valid": False, "error": "Text too long (max 10000 characters)"})
+        if len(text) > MAX_TEXT_LENGTH:
+            return ORJSONResponse(content={"valid": False, "error": f"Text too long (max {MAX_TEXT_LENGTH} characters)"})
         
-        return JSONResponse(content={
-            "valid": True, 
+        # Count words with the precompiled pattern instead of materializing
+        # a list of substrings twice via str.split
+        word_count = len(_WORD_RE.findall(text))
+
+        return ORJSONResponse(content={
+            "valid": True,
             "character_count": len(text),
-            "word_count": len(text.split()),
-            "estimated_duration": len(text.split()) * 0.5  # Rough estimate: 0.5 seconds per word
+            "word_count": word_count,
+            "estimated_duration": word_count * 0.5  # Rough estimate: 0.5 seconds per word
         })
         
     except Exception as e:
@@ -208,34 +596,15 @@ async def health_check():
 
 # Legacy endpoint for compatibility
 @app.post("/tts/legacy")
-async def legacy_text_to_speech(text: str = Form(...)):
+async def legacy_text_to_speech(text: str = Form(...),
+                                if_none_match: Optional[str] = Header(None)):
     """Legacy endpoint for backward compatibility"""
-    try:
-        if not text.strip():
-            raise HTTPException(status_code=400, detail="Text cannot be empty")
-            
-        # Convert text to speech
-        tts = gTTS(text=text, lang='en')
-        
-        # Create a bytes buffer
-        buf = io.BytesIO()
-        
-        # Write audio to buffer
-        tts.write_to_fp(buf)
-        
-        # Reset buffer position
-        buf.seek(0)
-        
-        # Return the audio stream
-        return StreamingResponse(
-            buf, 
-            media_type="audio/mpeg",
-            headers={
-                'Content-Disposition': 'attachment; filename="speech.mp3"'
-            }
-        )
-        
-    except gTTSError as e:
-        raise HTTPException(status_code=500, detail=f"Text to speech conversion failed: {str(e)}")
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"An unexpected error occurred: {str(e)}")
+    return await handle_tts(
+        text,
+        voice='en',
+        slow=False,
+        headers={
+            'Content-Disposition': f'attachment; filename="speech.{audio_file_ext("en", False)}"'
+        },
+        if_none_match=if_none_match
+    )
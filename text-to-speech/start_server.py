@@ -10,17 +10,24 @@ from app.main import app
 if __name__ == "__main__":
     # Get port from environment variable or use default
     port = int(os.environ.get("PORT", 8003))
-    
+
+    # Workers default to the CPU count; auto-reload is opt-in for development
+    # (uvicorn ignores workers when reload is on)
+    workers = int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1))
+    reload = os.environ.get("RELOAD", "").lower() in ("1", "true", "yes")
+
     print("🚀 Starting Learn Buddy Text-to-Speech API Server...")
     print(f"📍 Server will be available at: http://localhost:{port}")
     print(f"📖 API Documentation: http://localhost:{port}/docs")
+    print(f"👷 Workers: {workers}" + (" (reload mode: single worker)" if reload else ""))
     print("💡 Press Ctrl+C to stop the server")
     print("-" * 50)
-    
+
     uvicorn.run(
-        "app.main:app", 
-        host="0.0.0.0", 
+        "app.main:app",
+        host="0.0.0.0",
         port=port,
-        reload=True,
+        workers=workers,
+        reload=reload,
         log_level="info"
     )
\ No newline at end of file
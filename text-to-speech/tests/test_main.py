@@ -1,5 +1,9 @@
+import asyncio
+import time
+
 import pytest
 from fastapi.testclient import TestClient
+from app import main
 from app.main import app
 
 client = TestClient(app)
@@ -20,3 +24,133 @@ def test_text_to_speech_valid():
     assert response.status_code == 200
     assert response.headers["content-type"] == "audio/mpeg"
     assert "content-disposition" in response.headers
+
+def test_text_to_speech_oversized():
+    response = client.post("/tts", json={"text": "x" * 10001})
+    assert response.status_code == 413
+    assert "Text too long" in response.json()["detail"]
+
+def test_get_voices():
+    response = client.get("/voices")
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "public, max-age=86400"
+    voices = response.json()["voices"]
+    assert {"id": "en", "name": "English", "language": "English"} in voices
+
+def test_chunked_tts_sentences():
+    response = client.post("/tts/chunked", json={"text": "Hello world. How are you?"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total_chunks"] == 2
+    assert body["chunks"][0]["text"] == "Hello world."
+    assert body["chunks"][1]["text"] == "How are you?"
+
+def test_chunked_tts_words():
+    response = client.post("/tts/chunked", json={"text": "Hello  world", "chunk_type": "word"})
+    assert response.status_code == 200
+    body = response.json()
+    assert [c["text"] for c in body["chunks"]] == ["Hello", "world"]
+    assert body["chunks"][1]["start"] == 7
+
+def test_leader_disconnect_does_not_break_followers(monkeypatch):
+    def fake_write(text, voice, slow, fp):
+        fp.write(b"part1")
+        time.sleep(0.05)
+        fp.write(b"part2")
+
+    monkeypatch.setattr(main, "TTS_CACHE_DIR", "")
+    monkeypatch.setattr(main, "write_speech_to_fp", fake_write)
+    main._tts_cache.clear()
+
+    async def follow():
+        chunks = [chunk async for chunk in main.stream_speech_audio("Abandoned", "en", False)]
+        return b"".join(chunks)
+
+    async def scenario():
+        leader = main.stream_speech_audio("Abandoned", "en", False)
+        first = await anext(leader)
+        follower = asyncio.ensure_future(follow())
+        await asyncio.sleep(0)  # let the follower attach to the pending future
+        await leader.aclose()  # leader's client disconnects mid-stream
+        return first, await follower
+
+    first, follower_data = asyncio.run(scenario())
+    assert first == b"part1"
+    assert follower_data == b"part1part2"
+
+def test_long_text_synthesized_in_parallel_batches(monkeypatch):
+    calls = []
+
+    def fake_write(text, voice, slow, fp):
+        calls.append(text)
+        fp.write(text.encode())
+
+    monkeypatch.setattr(main, "TTS_CACHE_DIR", "")
+    monkeypatch.setattr(main, "write_speech_to_fp", fake_write)
+    main._tts_cache.clear()
+
+    text = " ".join(f"Sentence number {i} is right here." for i in range(30))
+    batches = main.batch_sentences(text)
+    assert len(batches) > 1
+
+    async def run():
+        chunks = [chunk async for chunk in main.stream_speech_audio(text, "en", False)]
+        return b"".join(chunks)
+
+    data = asyncio.run(run())
+    assert data == "".join(batches).encode()
+    assert sorted(calls) == sorted(batches)
+
+def test_validate_text_counts():
+    response = client.post("/tts/validate", data={"text": "Hello wonderful   world"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["valid"] is True
+    assert body["word_count"] == 3
+    assert body["character_count"] == 23
+
+def test_tts_cache_skips_repeat_synthesis(monkeypatch, tmp_path):
+    calls = []
+
+    def fake_write(text, voice, slow, fp):
+        calls.append(text)
+        fp.write(b"fake-mp3-bytes")
+
+    monkeypatch.setattr(main, "TTS_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(main, "write_speech_to_fp", fake_write)
+    main._tts_cache.clear()
+
+    first = client.post("/tts", json={"text": "Hello"})
+    second = client.post("/tts", json={"text": "Hello"})
+    assert first.status_code == 200
+    assert first.content == second.content == b"fake-mp3-bytes"
+    assert calls == ["Hello"]
+
+    # A matching If-None-Match revalidates without resending the audio
+    etag = first.headers["etag"]
+    revalidated = client.post("/tts", json={"text": "Hello"}, headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+def test_concurrent_requests_share_one_synthesis(monkeypatch):
+    calls = []
+
+    def fake_write(text, voice, slow, fp):
+        calls.append(text)
+        time.sleep(0.05)
+        fp.write(b"fake-mp3-bytes")
+
+    monkeypatch.setattr(main, "TTS_CACHE_DIR", "")
+    monkeypatch.setattr(main, "write_speech_to_fp", fake_write)
+    main._tts_cache.clear()
+
+    async def run_one():
+        chunks = [chunk async for chunk in main.stream_speech_audio("Shared", "en", False)]
+        return b"".join(chunks)
+
+    async def run_three():
+        return await asyncio.gather(run_one(), run_one(), run_one())
+
+    results = asyncio.run(run_three())
+    assert results == [b"fake-mp3-bytes"] * 3
+    assert calls == ["Shared"]